@@ -4,88 +4,153 @@ Generate sprite sheets for Troup'O Invaders
 Creates pixel art sprites of ruminants (cow, sheep, goat, alpaca)
 """
 
+import hashlib
+import json
 import struct
 import zlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+# PNG signature, the first 8 bytes of every PNG file
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Every row uses PNG filter type 0 (None). Sub/Up/Paeth filtering or a
+# per-row filter search only pays off on photographic images; these sprites
+# are flat colors with long transparent runs that deflate already handles
+FILTER_NONE = b'\x00'
+
+# zlib level for image data. The sprite sheets are committed and shipped
+# with the game; lower levels make them more than twice as large to save
+# only milliseconds of encode time, so keep maximum compression
+COMPRESSION_LEVEL = 9
 
 def create_png(width, height, color_rgb):
     """
     Create a simple PNG image with a solid color
     color_rgb: tuple of (r, g, b) values (0-255)
     """
-    # PNG signature
-    png_signature = b'\x89PNG\r\n\x1a\n'
-    
     # IHDR chunk (image header)
-    ihdr_data = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
-    ihdr_chunk = create_chunk(b'IHDR', ihdr_data)
+    ihdr_chunk = create_ihdr_chunk(width, height, 2)
     
     # IDAT chunk (image data)
-    raw_data = b''
-    r, g, b = color_rgb
-    for y in range(height):
-        raw_data += b'\x00'  # Filter type
-        raw_data += bytes([r, g, b] * width)
+    # Every row is identical: filter type byte followed by the pixels
+    row = FILTER_NONE + bytes(color_rgb) * width
+    raw_data = row * height
     
-    compressed_data = zlib.compress(raw_data, 9)
+    compressed_data = zlib.compress(raw_data, COMPRESSION_LEVEL)
     idat_chunk = create_chunk(b'IDAT', compressed_data)
     
-    # IEND chunk (end of file)
-    iend_chunk = create_chunk(b'IEND', b'')
-    
-    return png_signature + ihdr_chunk + idat_chunk + iend_chunk
+    return b''.join((PNG_SIGNATURE, ihdr_chunk, idat_chunk, IEND_CHUNK))
 
 def create_chunk(chunk_type, data):
     """Create a PNG chunk with type and data"""
-    length = struct.pack('>I', len(data))
-    crc = struct.pack('>I', zlib.crc32(chunk_type + data) & 0xffffffff)
-    return length + chunk_type + data + crc
+    length = len(data).to_bytes(4, 'big')
+    # Feed the type then the data to crc32 to avoid copying the data
+    crc = zlib.crc32(data, zlib.crc32(chunk_type)).to_bytes(4, 'big')
+    return b''.join((length, chunk_type, data, crc))
+
+# IEND chunk (end of file) is the same for every image
+IEND_CHUNK = create_chunk(b'IEND', b'')
 
-def create_image_from_pixels(width, height, pixels):
+@lru_cache(maxsize=8)
+def create_ihdr_chunk(width, height, color_type):
+    """Create the IHDR chunk for an 8-bit image of the given color type"""
+    ihdr_data = struct.pack('>IIBBBBB', width, height, 8, color_type, 0, 0, 0)
+    return create_chunk(b'IHDR', ihdr_data)
+
+def create_image_from_pixels(width, height, entries, pixels):
     """
-    Create a PNG from a 2D array of (r, g, b, a) tuples
-    pixels: list of lists, each inner list is a row of (r, g, b, a) tuples
+    Create an indexed-color PNG from rows of palette indices
+    entries: tuple of (r, g, b, a) palette entries
+    pixels: list of rows, each row is bytes holding one palette index per pixel
     """
-    png_signature = b'\x89PNG\r\n\x1a\n'
+    # IHDR chunk (indexed color: type 3)
+    ihdr_chunk = create_ihdr_chunk(width, height, 3)
+    
+    # PLTE chunk (r, g, b of each palette entry)
+    plte_chunk = create_chunk(b'PLTE', b''.join(bytes(rgba[:3]) for rgba in entries))
     
-    # IHDR chunk (with alpha channel: type 6)
-    ihdr_data = struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)
-    ihdr_chunk = create_chunk(b'IHDR', ihdr_data)
+    # tRNS chunk (alpha of each palette entry); entries past its end are
+    # opaque, so trailing opaque entries are left out
+    alphas = bytes(rgba[3] for rgba in entries).rstrip(b'\xff')
+    trns_chunk = create_chunk(b'tRNS', alphas) if alphas else b''
     
-    # Create image data with alpha
-    raw_data = b''
-    for row in pixels:
-        raw_data += b'\x00'  # Filter type
-        for pixel in row:
-            r, g, b, a = pixel
-            raw_data += bytes([r, g, b, a])
+    # Create image data
+    # Each row is a filter type byte followed by one index byte per pixel
+    stride = 1 + width
+    raw_data = bytearray(height * stride)
+    raw_data[::stride] = FILTER_NONE * height
+    for y, row in enumerate(pixels):
+        start = y * stride + 1
+        raw_data[start:start + width] = row
     
-    compressed_data = zlib.compress(raw_data, 9)
+    compressed_data = zlib.compress(raw_data, COMPRESSION_LEVEL)
     idat_chunk = create_chunk(b'IDAT', compressed_data)
-    iend_chunk = create_chunk(b'IEND', b'')
     
-    return png_signature + ihdr_chunk + idat_chunk + iend_chunk
+    return b''.join((PNG_SIGNATURE, ihdr_chunk, plte_chunk, trns_chunk, idat_chunk, IEND_CHUNK))
 
-def draw_sprite(pattern, colors):
+def draw_sprite(pattern, palette, width, height):
     """
     Convert a text pattern to pixels
     pattern: list of strings, each character represents a color key
-    colors: dict mapping characters to (r, g, b, a) tuples
+    palette: tuple of (character, (r, g, b, a)) pairs
+    width, height: frame size; the pattern is padded or cut to fit it
+    Returns a tuple of height rows, each row is bytes holding one index into
+    the entries of create_palette_table(palette) per pixel
+    """
+    return rasterize(tuple(pattern), palette, width, height)
+
+@lru_cache(maxsize=None)
+def rasterize(pattern, palette, width, height):
+    """
+    Cached worker for draw_sprite, so repeated frames are only drawn once
+    pattern: tuple of strings
+    palette: tuple of (character, (r, g, b, a)) pairs
     """
-    pixels = []
-    for line in pattern:
-        row = []
-        for char in line:
-            if char in colors:
-                row.append(colors[char])
-            else:
-                row.append((0, 0, 0, 0))  # Transparent
-        pixels.append(row)
-    return pixels
+    _, table = create_palette_table(palette)
+    rows = []
+    for line in pattern[:height]:
+        line = line[:width]
+        try:
+            # Translate the whole row from characters to palette indices at once
+            row = line.encode('latin-1').translate(table)
+        except UnicodeEncodeError:
+            # Characters outside Latin-1 cannot be palette keys, so they
+            # are transparent like any other character missing from it
+            row = bytes(table[ord(char)] if ord(char) < 256 else 0 for char in line)
+        # Short rows are padded with index 0 rather than spaces, so the
+        # padding is transparent whatever the palette maps ' ' to
+        rows.append(row.ljust(width, b'\x00'))
+    # Rows missing from the pattern are transparent
+    rows.extend([bytes(width)] * (height - len(rows)))
+    return tuple(rows)
 
-def create_spritesheet(frames, frame_width, frame_height):
+@lru_cache(maxsize=None)
+def create_palette_table(palette):
+    """
+    Number the colors of a palette for an indexed PNG
+    palette: tuple of (character, (r, g, b, a)) pairs
+    Returns (entries, table): entries is a tuple of (r, g, b, a) palette
+    entries and table is a bytes.translate table mapping each character
+    code to the index of its color
+    """
+    # Index 0 is transparent, so empty space and characters missing from
+    # the palette stay transparent
+    entries = [(0, 0, 0, 0)]
+    table = bytearray(256)
+    for char, rgba in palette:
+        if ord(char) > 255:
+            raise ValueError(f"Palette key {char!r} is not a Latin-1 character")
+        if rgba not in entries:
+            entries.append(rgba)
+        table[ord(char)] = entries.index(rgba)
+    return tuple(entries), bytes(table)
+
+def create_spritesheet(frames, palette, frame_width, frame_height):
     """
     Create a spritesheet from multiple frame patterns
-    frames: list of frame pixel arrays
+    frames: list of frames drawn by draw_sprite at frame_width x frame_height
+    palette: the palette every frame was drawn with
     Returns a combined spritesheet image
     """
     cols = 6
@@ -94,36 +159,30 @@ def create_spritesheet(frames, frame_width, frame_height):
     sheet_width = cols * frame_width
     sheet_height = rows * frame_height
     
-    # Initialize empty sheet
-    sheet_pixels = []
-    for _ in range(sheet_height):
-        row = [(0, 0, 0, 0)] * sheet_width
-        sheet_pixels.append(row)
+    # Fill the cells after the last frame with a transparent frame
+    empty_frame = (bytes(frame_width),) * frame_height
+    cells = list(frames) + [empty_frame] * (rows * cols - len(frames))
     
-    # Place frames
-    for i, frame in enumerate(frames):
-        col = i % cols
-        row = i // cols
-        start_x = col * frame_width
-        start_y = row * frame_height
-        
-        for y in range(min(len(frame), frame_height)):
-            for x in range(min(len(frame[y]), frame_width)):
-                sheet_pixels[start_y + y][start_x + x] = frame[y][x]
+    # Each sheet row joins the same row of every frame in its grid row
+    sheet_pixels = []
+    for row in range(rows):
+        grid_row = cells[row * cols:(row + 1) * cols]
+        sheet_pixels.extend(b''.join(lines) for lines in zip(*grid_row))
     
-    return create_image_from_pixels(sheet_width, sheet_height, sheet_pixels)
+    entries, _ = create_palette_table(palette)
+    return create_image_from_pixels(sheet_width, sheet_height, entries, sheet_pixels)
 
 # Cow sprite patterns (96x96)
 def create_cow_sprites():
-    colors = {
-        ' ': (0, 0, 0, 0),           # Transparent
-        'B': (139, 90, 43, 255),     # Brown body
-        'W': (255, 255, 255, 255),   # White spots
-        'D': (100, 65, 30, 255),     # Dark brown
-        'P': (255, 192, 203, 255),   # Pink nose
-        'H': (200, 200, 200, 255),   # Horn
-        'E': (50, 30, 20, 255),      # Eye
-    }
+    palette = (
+        (' ', (0, 0, 0, 0)),          # Transparent
+        ('B', (139, 90, 43, 255)),    # Brown body
+        ('W', (255, 255, 255, 255)),  # White spots
+        ('D', (100, 65, 30, 255)),    # Dark brown
+        ('P', (255, 192, 203, 255)),  # Pink nose
+        ('H', (200, 200, 200, 255)),  # Horn
+        ('E', (50, 30, 20, 255)),     # Eye
+    )
     
     # Simplified cow idle frame 1
     idle1 = [
@@ -177,39 +236,24 @@ def create_cow_sprites():
         "                          DDDDDDDDDD       DDDDDDDDDD                                           ",
         "                                                                                                ",
         "                                                                                                ",
-    ] + ["                                                                                                "] * 46
-    
-    # Walk frames with slight variations
-    walk1 = idle1  # Reuse idle for simplicity
-    walk2 = idle1
-    walk3 = idle1
-    
-    frames = [
-        draw_sprite(idle1, colors),
-        draw_sprite(idle1, colors),
-        draw_sprite(idle1, colors),
-        draw_sprite(idle1, colors),
-        draw_sprite(walk1, colors),
-        draw_sprite(walk2,colors),
-        draw_sprite(walk3, colors),
-        draw_sprite(walk1, colors),
-        draw_sprite(walk2, colors),
-        draw_sprite(walk3, colors),
     ]
     
-    return create_spritesheet(frames, 96, 96)
+    # Walk frames reuse idle for simplicity, so one drawing serves all frames
+    frames = [draw_sprite(idle1, palette, 96, 96)] * 10
+    
+    return create_spritesheet(frames, palette, 96, 96)
 
 # Sheep sprite patterns
 def create_sheep_sprites():
-    colors = {
-        ' ': (0, 0, 0, 0),           # Transparent
-        'W': (240, 240, 240, 255),   # White wool
-        'F': (220, 220, 220, 255),   # Fluffy wool
-        'D': (180, 180, 180, 255),   # Dark wool
-        'K': (80, 80, 80, 255),      # Dark gray face
-        'E': (30, 30, 30, 255),      # Eye
-        'L': (100, 100, 100, 255),   # Legs
-    }
+    palette = (
+        (' ', (0, 0, 0, 0)),          # Transparent
+        ('W', (240, 240, 240, 255)),  # White wool
+        ('F', (220, 220, 220, 255)),  # Fluffy wool
+        ('D', (180, 180, 180, 255)),  # Dark wool
+        ('K', (80, 80, 80, 255)),     # Dark gray face
+        ('E', (30, 30, 30, 255)),     # Eye
+        ('L', (100, 100, 100, 255)),  # Legs
+    )
     
     idle1 = [
         "                                                                                                ",
@@ -254,22 +298,22 @@ def create_sheep_sprites():
         "                            LLLLLL  LL    LL  LLLLLL                                           ",
         "                                                                                                ",
         "                                                                                                ",
-    ] + ["                                                                                                "] * 54
+    ]
     
-    frames = [draw_sprite(idle1, colors)] * 10
-    return create_spritesheet(frames, 96, 96)
+    frames = [draw_sprite(idle1, palette, 96, 96)] * 10
+    return create_spritesheet(frames, palette, 96, 96)
 
 # Goat sprite patterns
 def create_goat_sprites():
-    colors = {
-        ' ': (0, 0, 0, 0),           # Transparent
-        'B': (210, 180, 140, 255),   # Beige body
-        'D': (180, 150, 110, 255),   # Dark beige
-        'H': (230, 230, 230, 255),   # Horn
-        'R': (190, 160, 120, 255),   # Medium beige
-        'E': (50, 30, 20, 255),      # Eye
-        'G': (150, 120, 90, 255),    # Beard
-    }
+    palette = (
+        (' ', (0, 0, 0, 0)),          # Transparent
+        ('B', (210, 180, 140, 255)),  # Beige body
+        ('D', (180, 150, 110, 255)),  # Dark beige
+        ('H', (230, 230, 230, 255)),  # Horn
+        ('R', (190, 160, 120, 255)),  # Medium beige
+        ('E', (50, 30, 20, 255)),     # Eye
+        ('G', (150, 120, 90, 255)),   # Beard
+    )
     
     idle1 = [
         "                                                                                                ",
@@ -317,22 +361,22 @@ def create_goat_sprites():
         "                  DD  DD  DD        DD  DD  DD                                                 ",
         "                  DDDDDD  DD        DD  DDDDDD                                                 ",
         "                                                                                                ",
-    ] + ["                                                                                                "] * 52
+    ]
     
-    frames = [draw_sprite(idle1, colors)] * 10
-    return create_spritesheet(frames, 96, 96)
+    frames = [draw_sprite(idle1, palette, 96, 96)] * 10
+    return create_spritesheet(frames, palette, 96, 96)
 
 # Alpaca sprite patterns
 def create_alpaca_sprites():
-    colors = {
-        ' ': (0, 0, 0, 0),           # Transparent
-        'C': (245, 222, 179, 255),   # Cream body
-        'B': (222, 184, 135, 255),   # Brown
-        'W': (238, 203, 173, 255),   # Light wool
-        'E': (50, 30, 20, 255),      # Eye
-        'N': (200, 170, 130, 255),   # Nose
-        'D': (180, 150, 110, 255),   # Dark
-    }
+    palette = (
+        (' ', (0, 0, 0, 0)),          # Transparent
+        ('C', (245, 222, 179, 255)),  # Cream body
+        ('B', (222, 184, 135, 255)),  # Brown
+        ('W', (238, 203, 173, 255)),  # Light wool
+        ('E', (50, 30, 20, 255)),     # Eye
+        ('N', (200, 170, 130, 255)),  # Nose
+        ('D', (180, 150, 110, 255)),  # Dark
+    )
     
     idle1 = [
         "                                                                                                ",
@@ -383,180 +427,223 @@ def create_alpaca_sprites():
         "                            DD  DD  DD  DD  DD  DD                                             ",
         "                            DDDDDD  DD  DD  DDDDDD                                             ",
         "                                                                                                ",
-    ] + ["                                                                                                "] * 48
+    ]
     
-    frames = [draw_sprite(idle1, colors)] * 10
-    return create_spritesheet(frames, 96, 96)
-
-# Generate individual ruminant spritesheets
-print("Generating cow.png...")
-cow_png = create_cow_sprites()
-with open('assets/sprites/cow.png', 'wb') as f:
-    f.write(cow_png)
-print("✓ Created assets/sprites/cow.png (576x192, 96x96 frames)")
+    frames = [draw_sprite(idle1, palette, 96, 96)] * 10
+    return create_spritesheet(frames, palette, 96, 96)
 
-print("Generating sheep.png...")
-sheep_png = create_sheep_sprites()
-with open('assets/sprites/sheep.png', 'wb') as f:
-    f.write(sheep_png)
-print("✓ Created assets/sprites/sheep.png (576x192, 96x96 frames)")
+# Player ship palette
+PLAYER_PALETTE = (
+    (' ', (0, 0, 0, 0)),
+    ('C', (0, 255, 255, 255)),  # Cyan
+    ('B', (0, 200, 255, 255)),  # Blue
+    ('D', (0, 150, 200, 255)),  # Dark blue
+    ('O', (255, 165, 0, 255)),  # Orange thrust
+    ('Y', (255, 215, 0, 255)),  # Yellow thrust
+)
 
-print("Generating goat.png...")
-goat_png = create_goat_sprites()
-with open('assets/sprites/goat.png', 'wb') as f:
-    f.write(goat_png)
-print("✓ Created assets/sprites/goat.png (576x192, 96x96 frames)")
-
-print("Generating alpaca.png...")
-alpaca_png = create_alpaca_sprites()
-with open('assets/sprites/alpaca.png', 'wb') as f:
-    f.write(alpaca_png)
-print("✓ Created assets/sprites/alpaca.png (576x192, 96x96 frames)")
-
-
-# Generate player.png (48x48 frames, simpler for player ship)
-print("Generating player.png...")
-player_colors = {
-    ' ': (0, 0, 0, 0),
-    'C': (0, 255, 255, 255),     # Cyan
-    'B': (0, 200, 255, 255),     # Blue
-    'D': (0, 150, 200, 255),     # Dark blue
-    'O': (255, 165, 0, 255),     # Orange thrust
-    'Y': (255, 215, 0, 255),     # Yellow thrust
-}
+# Player ship patterns (48x48, simpler for player ship)
+def create_player_sprites():
+    player_idle = [
+        "                                                ",
+        "                       DD                       ",
+        "                      DDDD                      ",
+        "                     DDDDDD                     ",
+        "                    DDDDDDD                    ",
+        "                   DDDBBBDD                    ",
+        "                  DDDBBBBBDDD                   ",
+        "                 DDDBBBBBBDDDD                  ",
+        "                DDDBBBCCCBBBDDD                 ",
+        "               DDDBBCCCCCCBBDDD                 ",
+        "              DDDBBBCCCCCCBBBDDDD               ",
+        "             DDDBBBBCCCCCCBBBBDDD               ",
+        "            DDDBBBBBBCCCCBBBBBDDDD              ",
+        "           DDDBBBBBBBBBBBBBBBBBDDD              ",
+        "          DDDBBBBBBBBBBBBBBBBBBDDDD             ",
+        "         DDDBBBBBBBBBBBBBBBBBBBBDDD             ",
+        "        DDDBBBBBBBBBBBBBBBBBBBBBDDDD            ",
+    ]
+    
+    player_thrust = [
+        "                                                ",
+        "                       DD                       ",
+        "                      DDDD                      ",
+        "                     DDDDDD                     ",
+        "                    DDDDDDD                    ",
+        "                   DDDBBBDD                    ",
+        "                  DDDBBBBBDDD                   ",
+        "                 DDDBBBBBBDDDD                  ",
+        "                DDDBBBCCCBBBDDD                 ",
+        "               DDDBBCCCCCCBBDDD                 ",
+        "              DDDBBBCCCCCCBBBDDDD               ",
+        "             DDDBBBBCCCCCCBBBBDDD               ",
+        "            DDDBBBBBBCCCCBBBBBDDDD              ",
+        "           DDDBBBBBBBBBBBBBBBBBDDD              ",
+        "          DDDBBBBBBBBBBBBBBBBBBDDDD             ",
+        "         DDDBBBBBBBBBBBBBBBBBBBBDDD             ",
+        "        DDDBBBBBBBBBBBBBBBBBBBBBDDDD            ",
+        "       DDDBBBBBBBBBBBBBBBBBBBBBBDDDD            ",
+        "      DDDBBBBBBBBBBBBBBBBBBBBBBBBDDD            ",
+        "     DDDBBBBOOBBBBBBBBBBBBBBOOBBBBDDD           ",
+        "    DDDBBBBOOYYBBBBBBBBBBBBOOYYBBBBDDD          ",
+        "   DDDBBBBOOYYYYBBBBBBBBBBOOYYYYBBBBDDD         ",
+        "  DDDBBBBOOYYOOBBBBBBBBBBBBOOYYOOBBBBDDD        ",
+        " DDDBBBBOOOOOOBBBBBBBBBBBBBBOOOOOOBBBBDDD       ",
+        "DDDBBBBBOOOBBBBBBBBBBBBBBBBBBBBOOOBBBBBDDD      ",
+        "  DDDDOOOODDDDDDDDDDDDDDDDDDDDDDOOOODDDD        ",
+        "     OOOO                          OOOO         ",
+        "     OOO                            OOO         ",
+        "     OO                              OO         ",
+    ]
+    
+    idle = draw_sprite(player_idle, PLAYER_PALETTE, 48, 48)
+    thrust = draw_sprite(player_thrust, PLAYER_PALETTE, 48, 48)
+    player_frames = [idle] * 4 + [thrust] * 2
+    
+    return create_spritesheet(player_frames, PLAYER_PALETTE, 48, 48)
 
-player_idle = [
-    "                                                ",
-    "                       DD                       ",
-    "                      DDDD                      ",
-    "                     DDDDDD                     ",
-    "                    DDDDDDD                    ",
-    "                   DDDBBBDD                    ",
-    "                  DDDBBBBBDDD                   ",
-    "                 DDDBBBBBBDDDD                  ",
-    "                DDDBBBCCCBBBDDD                 ",
-    "               DDDBBCCCCCCBBDDD                 ",
-    "              DDDBBBCCCCCCBBBDDDD               ",
-    "             DDDBBBBCCCCCCBBBBDDD               ",
-    "            DDDBBBBBBCCCCBBBBBDDDD              ",
-    "           DDDBBBBBBBBBBBBBBBBBDDD              ",
-    "          DDDBBBBBBBBBBBBBBBBBBDDDD             ",
-    "         DDDBBBBBBBBBBBBBBBBBBBBDDD             ",
-    "        DDDBBBBBBBBBBBBBBBBBBBBBDDDD            ",
-] + ["                                                "] * 31
+# Projectile palette
+PROJECTILE_PALETTE = (
+    (' ', (0, 0, 0, 0)),
+    ('Y', (255, 255, 0, 255)),    # Yellow
+    ('W', (255, 255, 255, 255)),  # White
+    ('R', (255, 0, 0, 255)),      # Red
+    ('O', (255, 100, 0, 255)),    # Orange
+)
 
-player_thrust = [
-    "                                                ",
-    "                       DD                       ",
-    "                      DDDD                      ",
-    "                     DDDDDD                     ",
-    "                    DDDDDDD                    ",
-    "                   DDDBBBDD                    ",
-    "                  DDDBBBBBDDD                   ",
-    "                 DDDBBBBBBDDDD                  ",
-    "                DDDBBBCCCBBBDDD                 ",
-    "               DDDBBCCCCCCBBDDD                 ",
-    "              DDDBBBCCCCCCBBBDDDD               ",
-    "             DDDBBBBCCCCCCBBBBDDD               ",
-    "            DDDBBBBBBCCCCBBBBBDDDD              ",
-    "           DDDBBBBBBBBBBBBBBBBBDDD              ",
-    "          DDDBBBBBBBBBBBBBBBBBBDDDD             ",
-    "         DDDBBBBBBBBBBBBBBBBBBBBDDD             ",
-    "        DDDBBBBBBBBBBBBBBBBBBBBBDDDD            ",
-    "       DDDBBBBBBBBBBBBBBBBBBBBBBDDDD            ",
-    "      DDDBBBBBBBBBBBBBBBBBBBBBBBBDDD            ",
-    "     DDDBBBBOOBBBBBBBBBBBBBBOOBBBBDDD           ",
-    "    DDDBBBBOOYYBBBBBBBBBBBBOOYYBBBBDDD          ",
-    "   DDDBBBBOOYYYYBBBBBBBBBBOOYYYYBBBBDDD         ",
-    "  DDDBBBBOOYYOOBBBBBBBBBBBBOOYYOOBBBBDDD        ",
-    " DDDBBBBOOOOOOBBBBBBBBBBBBBBOOOOOOBBBBDDD       ",
-    "DDDBBBBBOOOBBBBBBBBBBBBBBBBBBBBOOOBBBBBDDD      ",
-    "  DDDDOOOODDDDDDDDDDDDDDDDDDDDDDOOOODDDD        ",
-    "     OOOO                          OOOO         ",
-    "     OOO                            OOO         ",
-    "     OO                              OO         ",
-] + ["                                                "] * 19
+# Projectile patterns (16x16)
+def create_projectile_sprites():
+    player_bullet = [
+        "      YYYY      ",
+        "     YYYYYY     ",
+        "    YYYYYYYY    ",
+        "   YYWWWWWWYY   ",
+        "  YYWWWWWWWWYY  ",
+        " YYWWWWWWWWWWYY ",
+        " YYWWWWWWWWWWYY ",
+        "YYWWWWWWWWWWWWYY",
+        "YYWWWWWWWWWWWWYY",
+        " YYWWWWWWWWWWYY ",
+        " YYWWWWWWWWWWYY ",
+        "  YYWWWWWWWWYY  ",
+        "   YYWWWWWWYY   ",
+        "    YYYYYYYY    ",
+        "     YYYYYY     ",
+        "      YYYY      ",
+    ]
+    
+    enemy_bullet = [
+        "      RRRR      ",
+        "     RRRRRR     ",
+        "    RRRRRRRR    ",
+        "   RROOOOOORRR  ",
+        "  RROOOOOOOOORR ",
+        " RROOOOOOOOOOORR",
+        " RROOOOOOOOOOORR",
+        "RROOOOOOOOOOOOORR",
+        "RROOOOOOOOOOOOORR",
+        " RROOOOOOOOOOORR",
+        " RROOOOOOOOOOORR",
+        "  RROOOOOOOOORR ",
+        "   RROOOOOORRR  ",
+        "    RRRRRRRR    ",
+        "     RRRRRR     ",
+        "      RRRR      ",
+    ]
+    
+    player_shot = draw_sprite(player_bullet, PROJECTILE_PALETTE, 16, 16)
+    enemy_shot = draw_sprite(enemy_bullet, PROJECTILE_PALETTE, 16, 16)
+    projectile_frames = [player_shot] * 2 + [enemy_shot] * 2
+    
+    return create_spritesheet(projectile_frames, PROJECTILE_PALETTE, 16, 16)
 
-player_frames = [
-    draw_sprite(player_idle, player_colors),
-    draw_sprite(player_idle, player_colors),
-    draw_sprite(player_idle, player_colors),
-    draw_sprite(player_idle, player_colors),
-    draw_sprite(player_thrust, player_colors),
-    draw_sprite(player_thrust, player_colors),
+# Spritesheets to generate: (name, builder, description, summary)
+SPRITESHEETS = [
+    ('cow', create_cow_sprites, "576x192, 96x96 frames", "cow with spots and horns"),
+    ('sheep', create_sheep_sprites, "576x192, 96x96 frames", "fluffy white sheep"),
+    ('goat', create_goat_sprites, "576x192, 96x96 frames", "goat with horns and beard"),
+    ('alpaca', create_alpaca_sprites, "576x192, 96x96 frames", "alpaca with long neck"),
+    ('player', create_player_sprites, "288x96, 48x48 frames", "player spaceship"),
+    ('projectiles', create_projectile_sprites, "96x16, 16x16 frames", "bullets"),
 ]
 
-player_spritesheet = create_spritesheet(player_frames, 48, 48)
-with open('assets/sprites/player.png', 'wb') as f:
-    f.write(player_spritesheet)
-print("✓ Created assets/sprites/player.png (288x96, 48x48 frames)")
+# Records the script version and the sheet digests of the last build
+STAMP_PATH = 'assets/sprites/.generated'
 
-# Generate projectiles.png (16x16 frames)
-print("Generating projectiles.png...")
-projectile_colors = {
-    ' ': (0, 0, 0, 0),
-    'Y': (255, 255, 0, 255),     # Yellow
-    'W': (255, 255, 255, 255),   # White
-    'R': (255, 0, 0, 255),       # Red
-    'O': (255, 100, 0, 255),     # Orange
-}
+def spritesheet_path(name):
+    """Path of the PNG file for the named spritesheet"""
+    return f'assets/sprites/{name}.png'
 
-player_bullet = [
-    "      YYYY      ",
-    "     YYYYYY     ",
-    "    YYYYYYYY    ",
-    "   YYWWWWWWYY   ",
-    "  YYWWWWWWWWYY  ",
-    " YYWWWWWWWWWWYY ",
-    " YYWWWWWWWWWWYY ",
-    "YYWWWWWWWWWWWWYY",
-    "YYWWWWWWWWWWWWYY",
-    " YYWWWWWWWWWWYY ",
-    " YYWWWWWWWWWWYY ",
-    "  YYWWWWWWWWYY  ",
-    "   YYWWWWWWYY   ",
-    "    YYYYYYYY    ",
-    "     YYYYYY     ",
-    "      YYYY      ",
-]
+def file_digest(path):
+    """Hash a file's contents, or return None if it does not exist"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+    except FileNotFoundError:
+        return None
 
-enemy_bullet = [
-    "      RRRR      ",
-    "     RRRRRR     ",
-    "    RRRRRRRR    ",
-    "   RROOOOOORRR  ",
-    "  RROOOOOOOOORR ",
-    " RROOOOOOOOOOORR",
-    " RROOOOOOOOOOORR",
-    "RROOOOOOOOOOOOORR",
-    "RROOOOOOOOOOOOORR",
-    " RROOOOOOOOOOORR",
-    " RROOOOOOOOOOORR",
-    "  RROOOOOOOOORR ",
-    "   RROOOOOORRR  ",
-    "    RRRRRRRR    ",
-    "     RRRRRR     ",
-    "      RRRR      ",
-]
+def source_key():
+    """Hash this script, which holds every sprite pattern and palette"""
+    return file_digest(__file__)
 
-projectile_frames = [
-    draw_sprite(player_bullet, projectile_colors),
-    draw_sprite(player_bullet, projectile_colors),
-    draw_sprite(enemy_bullet, projectile_colors),
-    draw_sprite(enemy_bullet, projectile_colors),
-]
+def read_stamp():
+    """
+    Return the stamp of the last build, holding its source key and the
+    digest of each sheet, or an empty dict if there is no usable stamp
+    """
+    try:
+        with open(STAMP_PATH) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
 
-projectiles_spritesheet = create_spritesheet(projectile_frames, 16, 16)
-with open('assets/sprites/projectiles.png', 'wb') as f:
-    f.write(projectiles_spritesheet)
-print("✓ Created assets/sprites/projectiles.png (96x16, 16x16 frames)")
+def write_spritesheet(name, create_sprites):
+    """Build a spritesheet and write it to assets/sprites/<name>.png"""
+    path = spritesheet_path(name)
+    png_data = create_sprites()
+    with open(path, 'wb') as f:
+        f.write(png_data)
+    return path
 
-print("\n✓ All sprite sheets generated successfully!")
-print("\nSprite sheets created:")
-print("  - assets/sprites/cow.png (cow with spots and horns)")
-print("  - assets/sprites/sheep.png (fluffy white sheep)")
-print("  - assets/sprites/goat.png (goat with horns and beard)")
-print("  - assets/sprites/alpaca.png (alpaca with long neck)")
-print("  - assets/sprites/player.png (player spaceship)")
-print("  - assets/sprites/projectiles.png (bullets)")
-print("\nYou can now test the sprites at http://localhost:8080/sprite-example.html")
+if __name__ == '__main__':
+    # Skip sheets built by an identical version of this script whose files
+    # are still the ones it wrote
+    key = source_key()
+    stamp = read_stamp()
+    built = stamp.get('sheets', {}) if stamp.get('source') == key else {}
+    
+    pending = []
+    for name, create_sprites, description, summary in SPRITESHEETS:
+        path = spritesheet_path(name)
+        if name in built and file_digest(path) == built[name]:
+            print(f"✓ {path} is up to date")
+        else:
+            print(f"Generating {name}.png...")
+            pending.append((name, create_sprites, description, summary))
+    
+    # The sheets are independent and zlib releases the GIL while
+    # compressing, so build and write them on a thread pool
+    with ThreadPoolExecutor(max_workers=len(SPRITESHEETS)) as executor:
+        futures = [
+            executor.submit(write_spritesheet, name, create_sprites)
+            for name, create_sprites, _, _ in pending
+        ]
+        for future, (_, _, description, _) in zip(futures, pending):
+            print(f"✓ Created {future.result()} ({description})")
+    
+    with open(STAMP_PATH, 'w') as f:
+        json.dump({
+            'source': key,
+            'sheets': {name: file_digest(spritesheet_path(name)) for name, *_ in SPRITESHEETS},
+        }, f, indent=2)
+    
+    if not pending:
+        print("\n✓ All sprite sheets are up to date, nothing to regenerate")
+    else:
+        # Print the summary as a single write
+        print("\n".join([
+            "\n✓ Sprite sheets generated successfully!",
+            "\nSprite sheets created:",
+            *(f"  - {spritesheet_path(name)} ({summary})" for name, _, _, summary in pending),
+            "\nYou can now test the sprites at http://localhost:8080/sprite-example.html",
+        ]))